@@ -3,20 +3,34 @@
 Scrapes recruiting class data from 247Sports composite rankings (2019-2026)
 
 OPTIMIZATIONS:
+- Profiles fetched over HTTP (httpx); Playwright drives the listing page and is the fallback
+- Load More pages fetched in parallel over HTTP (button clicking is the fallback)
 - Deep timeline dive for top 1000 players only (commitment dates)
 - Early exit when commitment found (no unnecessary pagination)
-- Incremental CSV saves (no data loss on timeout)
+- Streaming CSV writes, one row per profile (no data loss on timeout)
 - Resume capability (can continue from player #X)
+- Optional gzip HTML cache for offline re-parsing (USE_CACHE=true)
 - No debug logging (maximum speed)
 """
 
 import asyncio
 import csv
+import gzip
+import multiprocessing
+import operator
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
+from html import escape, unescape
 from pathlib import Path
+from urllib.parse import urljoin
+import httpx
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 # =============================================================================
@@ -26,14 +40,38 @@ from playwright.async_api import async_playwright, TimeoutError as PlaywrightTim
 YEARS = [int(os.getenv('SCRAPE_YEAR', '2019'))]  # Set by workflow matrix
 OUTPUT_DIR = Path("output")
 TEST_MODE = os.getenv('TEST_MODE', 'false').lower() == 'true'
-MAX_CONCURRENT = 4
+MAX_CONCURRENT = 4  # Browser pages per context (only the fallback path renders)
+PROFILE_CONCURRENT = MAX_CONCURRENT * 4  # Profiles in flight at once (mostly plain HTTP)
+LISTING_PAGE_WAVE = MAX_CONCURRENT * 2  # Load More pages fetched in parallel per HTTP wave
+PARSE_WORKERS = os.cpu_count() or 1  # Processes parsing profile HTML (sidesteps the GIL)
+MAX_CONCURRENT_YEARS = 2  # Years scraped in parallel (each with its own context)
+CONTEXT_ROTATE_EVERY = MAX_CONCURRENT * 20  # Browser-fallback profiles per context before it is recycled (bounds Chromium memory)
 DEEP_TIMELINE_LIMIT = 1000  # Only get commitment dates for top 1000 players
+TIMELINE_MAX_PAGES = 10
 
 # Resume capability
 START_FROM_PLAYER = int(os.getenv('START_FROM', '0'))  # Set via workflow input
 
+# HTML cache (re-parse previous runs without re-fetching)
+CACHE_DIR = OUTPUT_DIR / "cache"
+USE_CACHE = os.getenv('USE_CACHE', 'false').lower() == 'true'
+REFRESH_CACHE = os.getenv('REFRESH_CACHE', 'false').lower() == 'true'  # Re-fetch and overwrite cached pages
+
+DIAGNOSTICS_DIR = OUTPUT_DIR / "diagnostics"  # Uploaded as the Diagnostics artifact
+
+# Cookies/localStorage from the last successful listing load (skips the cold bot check)
+STORAGE_STATE_PATH = OUTPUT_DIR / "state.json"
+
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
+# Never read by the parser - aborted at the network layer
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet", "websocket", "other"}
+BLOCKED_DOMAINS = (
+    "googletagmanager", "doubleclick", "google-analytics", "googlesyndication", "facebook.net",
+    "adservice", "adsrvr", "amazon-adsystem", "taboola", "outbrain", "scorecardresearch", "quantserve",
+    "cdn.segment.com", "api.segment.io",
+)
+
 # =============================================================================
 # DATA STRUCTURES
 # =============================================================================
@@ -47,17 +85,146 @@ CSV_HEADERS = [
     "Profile URL", "Scrape Date", "Data Source"
 ]
 
+# Blank row template - copied per player ("NA" is the missing-value sentinel)
+DEFAULT_ROW = dict.fromkeys(CSV_HEADERS, "NA")
+
+# Row dict -> CSV values in header order (every row starts from DEFAULT_ROW, so all keys exist)
+ROW_VALUES = operator.itemgetter(*CSV_HEADERS)
+
+# =============================================================================
+# COMPILED SELECTORS
+# =============================================================================
+
+# Compiled once so soupsieve doesn't re-parse the CSS on every profile.
+# Single tag/class lookups use find()/find_all() instead (no CSS engine at all).
+SEL_TIMELINE_ITEMS = sv.compile('.timeline-item, .timeline li, ul.timeline > li, .vertical-timeline-element-content')
+SEL_METRICS_ITEMS = sv.compile('.metrics-list li')
+SEL_DETAILS_ITEMS = sv.compile('.details li')
+SEL_VITALS_ITEMS = sv.compile('ul.vitals li')
+RANKING_SECTIONS_CSS = 'section.rankings, section.rankings-section, div.ranking-section'
+SEL_RANKING_SECTIONS = sv.compile(RANKING_SECTIONS_CSS)
+SEL_STARS = sv.compile('span.icon-starsolid.yellow, i.icon-starsolid.yellow')
+
+# Full-timeline pages are only read for these two lookups, so they skip
+# BeautifulSoup and go straight through lxml with compiled XPath
+XP_FULL_TIMELINE_ITEMS = etree.XPath("//ul[contains(concat(' ', normalize-space(@class), ' '), ' timeline-event-index_lst ')]//li")
+XP_TIMELINE_NEXT_HREF = etree.XPath("//li[contains(concat(' ', normalize-space(@class), ' '), ' next_itm ')]//a/@href")
+
+# =============================================================================
+# COMPILED PATTERNS
+# =============================================================================
+
+RE_PLAYER_ID = re.compile(r'/player/[^/]+-(\d+)/')
+RE_RANK = re.compile(r'#?(\d+)')
+RE_NUMBER = re.compile(r'(\d+(?:\.\d+)?)')
+RE_DATE = re.compile(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})')
+RE_DATE_MMDDYYYY = re.compile(r'\d{2}/\d{2}/\d{4}$')  # Already the output format
+RE_DATE_SLASH = re.compile(r'\d{1,2}/\d{1,2}/\d{4}$')
+RE_DATE_ABBR_MONTH = re.compile(r'[A-Z][a-z]{2}\s+\d{1,2},\s+\d{4}$')
+RE_DATE_FULL_MONTH = re.compile(r'[A-Z][a-z]+\s+\d{1,2},\s+\d{4}$')
+RE_COMMITMENT_KEYWORD = re.compile(r'commit(?:ment|ted|s to)|sign(?:ed|ing)')  # Run on lowercased text
+RE_TEAM = re.compile(r'(?:to|with|at|commits to)\s+([A-Z][^,.]+)')
+RE_DRAFT_TEAM = re.compile(r'(?:Draft[:\s]+)?([A-Z][A-Za-z0-9\s\.]+?)\s+(?:select|pick)', re.IGNORECASE)
+RE_DRAFT_PREFIX = re.compile(r'^Draft\s*', re.IGNORECASE)
+RE_HEADER_ITEM = re.compile(r'(Pos(?:ition)?|Height|Weight|High School|Home Town|Hometown|City|Class)[:\s]*(.*)')
+RE_URL_SUFFIX = re.compile(r'[?#].*$')
+RE_RECRUITING_PROFILE_LINK = re.compile(r'<a\b[^>]*\bhref="([^"]+)"[^>]*>\s*(?:<(?!/?a\b)[^>]*>\s*)*(?:View\s+)?Recruiting Profile', re.IGNORECASE)
+RE_TIMELINE_LINK = re.compile(r'href="([^"]*TimelineEvents[^"]*)"')
+# Same containers as RANKING_SECTIONS_CSS (whole class tokens on section/div only,
+# so nav items like <li class="rankings"> don't count)
+RANKING_SECTION_TAG = (
+    r'<section\b[^>]*\bclass="(?:[^"]*\s)?(?:rankings|rankings-section)["\s]'
+    r'|<div\b[^>]*\bclass="(?:[^"]*\s)?ranking-section["\s]'
+)
+RE_RANKING_SECTION = re.compile(RANKING_SECTION_TAG)
+# Profile data is present (worth caching): a ranking section or the ul.vitals list
+RE_PROFILE_CONTENT = re.compile(RANKING_SECTION_TAG + r'|<ul\b[^>]*\bclass="(?:[^"]*\s)?vitals["\s]')
+RE_BLOCK_PAGE = re.compile(r'cf-challenge|Access Denied|Request unsuccessful\. Incapsula')
+RE_LISTING_PAGE = re.compile(r'([?&]Page=)(\d+)', re.IGNORECASE)
+
+# Load More pages are bare rows of the ranking list - only the profile links matter
+LISTING_LINK_STRAINER = SoupStrainer('a', href=re.compile('/player/'))
+
+# Only build the subtrees parse_profile reads (skips nav, ads, footer, scripts).
+# Matches whole class tokens - the outermost classes of every profile selector
+# above - so wrappers like "username" or "commit-list-item" don't drag whole
+# unrelated subtrees in. (At parse time the class attribute is still one
+# space-separated string, hence the whitespace anchors.)
+PROFILE_STRAINER = SoupStrainer(class_=re.compile(
+    r'(?:^|\s)(?:name|metrics-list|details|vitals|rankings|rankings-section|ranking-section|'
+    r'timeline|timeline-item|vertical-timeline-element-content|commit-banner|commitment)(?:\s|$)'
+))
+
+# [selector, count] for the first selector that matches anything, else null
+FIRST_MATCHING_SELECTOR_JS = """sels => {
+    for (const sel of sels) {
+        const count = document.querySelectorAll(sel).length;
+        if (count) return [sel, count];
+    }
+    return null;
+}"""
+
+# Clicks Load More until it disappears (or max clicks), each time waiting up to
+# 10s for new rows to render. Gives up after 2 clicks in a row add nothing
+# (rate-limited but the button is still shown). Returns [clicks, stalled].
+LOAD_MORE_JS = """async ([rowSel, maxClicks]) => {
+    const rows = () => document.querySelectorAll(rowSel).length;
+    const findButton = () => document.querySelector('a.load-more, button.load-more, a.rankings-page__showmore')
+        || [...document.querySelectorAll('a')].find(a => a.textContent.includes('Load More'));
+    let clicks = 0, stalls = 0;
+    while (clicks < maxClicks && stalls < 2) {
+        const button = findButton();
+        if (!button || !button.offsetParent) break;
+        const before = rows();
+        button.click();
+        clicks++;
+        const deadline = Date.now() + 10000;
+        while (rows() <= before && Date.now() < deadline) await new Promise(r => setTimeout(r, 100));
+        stalls = rows() > before ? 0 : stalls + 1;
+    }
+    return [clicks, stalls >= 2];
+}"""
+
+# Resolved href of every matched anchor, in document order (deduped in Python after normalizing)
+ALL_HREFS_JS = "els => els.map(e => e.href)"
+
+# Any of these on the page means the profile HTML has rendered
+PROFILE_READY_SELECTOR = '.name, section.rankings, ul.vitals, a:has-text("Recruiting Profile")'
+
+# Serializes only the outermost elements parse_profile reads, so Python
+# parses a few KB of fragments instead of the whole rendered document
+PROFILE_FRAGMENT_JS = """() => {
+    const sel = '.name, .metrics-list, .details, ul.vitals, section.rankings, section.rankings-section, '
+              + 'div.ranking-section, .timeline, .timeline-item, .vertical-timeline-element-content, '
+              + '.commit-banner, .commitment';
+    const kept = [];
+    for (const el of document.querySelectorAll(sel)) {
+        if (kept.length && kept[kept.length - 1].contains(el)) continue;
+        kept.push(el);
+    }
+    return '<html><body>' + kept.map(el => el.outerHTML).join('') + '</body></html>';
+}"""
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
 
 def extract_player_id(url: str) -> str:
-    match = re.search(r'/player/[^/]+-(\d+)/', url)
+    match = RE_PLAYER_ID.search(url)
     return match.group(1) if match else "NA"
 
+def absolute_url(href: str) -> str:
+    return f"https://247sports.com{href}" if href.startswith('/') else href
+
+def normalize_player_url(url: str) -> str:
+    return RE_URL_SUFFIX.sub('', url).rstrip('/') + '/'
+
+# Newlines become spaces, carriage returns are dropped - in one pass
+CLEAN_TEXT_TABLE = str.maketrans({'\n': ' ', '\r': None})
+
 def clean_text(text: str) -> str:
     if not text: return "NA"
-    return text.strip().replace('\n', ' ').replace('\r', '')
+    return text.strip().translate(CLEAN_TEXT_TABLE)
 
 def normalize_height(height_str: str) -> str:
     """Normalize height to prevent Excel from converting to dates (6-3 → '6-3)"""
@@ -75,25 +242,28 @@ def normalize_height(height_str: str) -> str:
 
 def parse_rank(text: str) -> str:
     if not text: return "NA"
-    match = re.search(r'#?(\d+)', text)
+    match = RE_RANK.search(text)
     return match.group(1) if match else "NA"
 
+DATE_FORMATS = (
+    (RE_DATE_SLASH, "%m/%d/%Y"),
+    (RE_DATE_ABBR_MONTH, "%b %d, %Y"),
+    (RE_DATE_FULL_MONTH, "%B %d, %Y"),
+)
+
 def normalize_date(date_str: str) -> str:
     """Converts various date formats to MM/DD/YYYY"""
     if not date_str: return "NA"
     date_str = clean_text(date_str)
+    if RE_DATE_MMDDYYYY.match(date_str): return date_str  # strptime would only round-trip it
     
-    formats = [
-        "%m/%d/%Y",
-        "%b %d, %Y",
-        "%B %d, %Y"
-    ]
-    
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt).strftime("%m/%d/%Y")
-        except ValueError:
-            continue
+    # Pick the one format the string can be, so strptime runs (and can raise) at most once
+    for pattern, fmt in DATE_FORMATS:
+        if pattern.match(date_str):
+            try:
+                return datetime.strptime(date_str, fmt).strftime("%m/%d/%Y")
+            except ValueError:
+                break
     return date_str
 
 def is_date_valid_for_class(date_str: str, recruiting_year: int) -> bool:
@@ -106,96 +276,273 @@ def is_date_valid_for_class(date_str: str, recruiting_year: int) -> bool:
     except:
         return True
 
-def append_to_csv(filename: Path, players: list):
-    """Append players to CSV file (creates if doesn't exist)"""
-    file_exists = filename.exists()
+def open_csv_writer(filename: Path):
+    """Open CSV for appending (writes header if new) and return (file, writer)"""
+    file_exists = filename.exists() and filename.stat().st_size > 0
     
-    with open(filename, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerows(players)
+    f = open(filename, 'a', newline='', encoding='utf-8')
+    writer = csv.writer(f)
+    if not file_exists:
+        writer.writerow(CSV_HEADERS)
+    return f, writer
+
+def load_cached(key: str):
+    """Return cached HTML for key, or None if missing/disabled"""
+    if not USE_CACHE or REFRESH_CACHE or key.startswith("NA"):
+        return None
+    path = CACHE_DIR / f"{key}.html.gz"
+    if not path.exists():
+        return None
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return f.read()
+
+def save_cached(key: str, html: str):
+    """Gzip-write HTML for key into the cache directory"""
+    if key.startswith("NA"):
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with gzip.open(CACHE_DIR / f"{key}.html.gz", 'wt', encoding='utf-8') as f:
+        f.write(html)
+
+# =============================================================================
+# BROWSER CONTEXT
+# =============================================================================
+
+async def block_unneeded_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(d in request.url for d in BLOCKED_DOMAINS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def new_scraping_context(browser):
+    """New context with our User-Agent (and saved storage state) that skips images, fonts, CSS and trackers"""
+    storage_state = str(STORAGE_STATE_PATH) if STORAGE_STATE_PATH.exists() else None
+    context = await browser.new_context(user_agent=USER_AGENT, storage_state=storage_state)
+    await context.route("**/*", block_unneeded_resources)
+    return context
+
+def new_http_client(cookies: dict) -> httpx.AsyncClient:
+    """HTTP/2 client that presents the browser's User-Agent and cookies"""
+    return httpx.AsyncClient(
+        http2=True,
+        headers={'User-Agent': USER_AGENT},
+        cookies=cookies,
+        follow_redirects=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=PROFILE_CONCURRENT),
+    )
+
+class PagePool:
+    """
+    Up to MAX_CONCURRENT reusable pages for the browser fallback, opened on first use.
+    
+    After CONTEXT_ROTATE_EVERY borrows the context is recycled as soon as every page
+    is back (long-lived contexts leak memory; storage state keeps the new one warm).
+    Only browser borrowers wait for that - HTTP-served profiles never touch the pool.
+    """
+    
+    def __init__(self, browser, context):
+        self.browser = browser
+        self.context = context
+        self.idle_pages = []
+        self.in_use = 0
+        self.borrows = 0
+        self.changed = asyncio.Condition()
+    
+    def _can_lend(self) -> bool:
+        return self.in_use < MAX_CONCURRENT and (self.borrows < CONTEXT_ROTATE_EVERY or self.in_use == 0)
+    
+    async def acquire(self):
+        async with self.changed:
+            await self.changed.wait_for(self._can_lend)
+            if self.borrows >= CONTEXT_ROTATE_EVERY:
+                await self.context.close()  # Closes the idle pages too
+                self.context = await new_scraping_context(self.browser)
+                self.idle_pages.clear()
+                self.borrows = 0
+            self.in_use += 1
+            self.borrows += 1
+            if self.idle_pages:
+                return self.idle_pages.pop()
+        try:
+            return await self.context.new_page()
+        except Exception:
+            await self._returned(None)
+            raise
+    
+    async def release(self, page):
+        # Drop the last profile's DOM before the page goes back for reuse. A crashed or
+        # closed page is dropped instead - acquire opens a fresh one when none are idle
+        dead = page.is_closed()
+        if not dead and page.url != 'about:blank':
+            try:
+                await page.goto('about:blank')
+            except Exception:
+                dead = True
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        await self._returned(None if dead else page)
+    
+    async def _returned(self, page):
+        async with self.changed:
+            if page is not None:
+                self.idle_pages.append(page)
+            self.in_use -= 1
+            self.changed.notify_all()
+    
+    async def close(self):
+        await self.context.close()
+
+@asynccontextmanager
+async def pooled_page(page_pool: PagePool):
+    """Borrow a page from the pool; it is blanked and returned (never closed) afterwards"""
+    page = await page_pool.acquire()
+    try:
+        yield page
+    finally:
+        await page_pool.release(page)
+
+async def save_diagnostics(page, name: str):
+    """Screenshot + HTML of a page that failed, for the Diagnostics artifact"""
+    try:
+        DIAGNOSTICS_DIR.mkdir(parents=True, exist_ok=True)
+        await page.screenshot(path=str(DIAGNOSTICS_DIR / f"{name}.png"), full_page=True)
+        (DIAGNOSTICS_DIR / f"{name}.html").write_text(await page.content(), encoding='utf-8')
+    except Exception:
+        pass  # Diagnostics must never mask the original failure
 
 # =============================================================================
 # LOAD MORE FUNCTIONALITY
 # =============================================================================
 
-async def click_load_more_until_complete(browser, year: int) -> list:
+async def fetch_listing_pages_http(client, showmore_href: str, max_pages: int):
+    """
+    Fetch the Load More pages straight from their endpoint, LISTING_PAGE_WAVE at a time.
+    
+    Returns the player hrefs in rank order, or None if the endpoint refuses us,
+    serves a block page or has no rows at all (the caller then falls back to
+    clicking the button).
+    """
+    page_match = RE_LISTING_PAGE.search(showmore_href)
+    if not page_match:
+        return None
+    
+    first_page = int(page_match.group(2))
+    hrefs = []
+    
+    try:
+        for wave_start in range(first_page, first_page + max_pages, LISTING_PAGE_WAVE):
+            wave = range(wave_start, min(wave_start + LISTING_PAGE_WAVE, first_page + max_pages))
+            responses = await asyncio.gather(*(
+                client.get(RE_LISTING_PAGE.sub(rf'\g<1>{n}', showmore_href, count=1)) for n in wave
+            ))
+            for response in responses:
+                if response.status_code != 200 or RE_BLOCK_PAGE.search(response.text):
+                    return None
+                links = BeautifulSoup(response.text, 'lxml', parse_only=LISTING_LINK_STRAINER).find_all('a')
+                if not links:
+                    # Past the last page - unless not even the first page had rows (not a real listing)
+                    return hrefs if hrefs else None
+                hrefs.extend(link['href'] for link in links)
+    except httpx.HTTPError:
+        return None
+    
+    return hrefs
+
+async def click_load_more_until_complete(context, year: int) -> list:
     print(f"\n📋 Loading all players for {year}...")
     
-    context = await browser.new_context(user_agent=USER_AGENT)
     page = await context.new_page()
     
     url = f"https://247sports.com/season/{year}-football/compositerecruitrankings/"
     
-    try:
-        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-        await page.wait_for_timeout(2000)
-    except Exception as e:
-        print(f"❌ Failed to load initial page for {year}: {e}")
-        await context.close()
-        return []
-
     selectors = [
         "li.rankings-page__list-item",
         "li.recruit",
         ".rankings-page__container ul > li"
     ]
     
-    valid_selector = None
-    for selector in selectors:
-        count = await page.locator(selector).count()
-        if count > 0:
-            valid_selector = selector
-            print(f"  ✓ Found {count} players using selector: '{selector}'")
-            break
+    try:
+        await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+    except Exception as e:
+        print(f"❌ Failed to load initial page for {year}: {e}")
+        await save_diagnostics(page, f"listing_{year}")
+        await page.close()
+        return []
+    
+    # Proceed as soon as the first rows render (the probe below reports if none do)
+    try:
+        await page.wait_for_selector(", ".join(selectors), timeout=15000)
+    except PlaywrightTimeoutError:
+        pass
+    
+    # All candidate selectors probed in one round trip
+    probe = await page.evaluate(FIRST_MATCHING_SELECTOR_JS, selectors)
+    valid_selector = probe[0] if probe else None
+    if valid_selector:
+        print(f"  ✓ Found {probe[1]} players using selector: '{valid_selector}'")
             
     if not valid_selector:
         print(f"⚠️  No players found")
-        await context.close()
+        await save_diagnostics(page, f"listing_{year}")
+        await page.close()
         return []
 
-    click_count = 0
     max_clicks = 500 if not TEST_MODE else 1
     
-    while click_count < max_clicks:
-        current_players = await page.locator(valid_selector).count()
-        load_more_button = page.locator('a.load-more, button.load-more, a.rankings-page__showmore, a:has-text("Load More")')
-        
+    # Fast path: request the remaining pages in parallel over HTTP instead of clicking serially
+    more_hrefs = None
+    showmore = page.locator('a.rankings-page__showmore')
+    if await showmore.count() > 0:
+        showmore_href = await showmore.first.get_attribute('href')
+        if showmore_href:
+            cookies = {c['name']: c['value'] for c in await context.cookies()}
+            async with new_http_client(cookies) as client:
+                more_hrefs = await fetch_listing_pages_http(client, urljoin(url, showmore_href), max_clicks)
+            if more_hrefs is not None:
+                print(f"  ✓ Fetched {len(more_hrefs)} more player links over HTTP")
+    
+    if more_hrefs is None:
+        # Click loop runs inside the page - no CDP round trips per click
         try:
-            if await load_more_button.count() > 0 and await load_more_button.first.is_visible():
-                print(f"  → Click #{click_count + 1}: {current_players} players loaded...")
-                await load_more_button.first.click()
-                await page.wait_for_timeout(1500)
-                click_count += 1
+            click_count, stalled = await page.evaluate(LOAD_MORE_JS, [valid_selector, max_clicks])
+            if stalled:
+                print(f"  ⚠️  Load More stopped adding players after {click_count} clicks - continuing with what loaded")
             else:
-                print(f"  ✓ All players loaded!")
-                break
+                print(f"  ✓ All players loaded after {click_count} Load More clicks")
         except Exception:
             print(f"  ✓ Load complete")
-            break
     
     print(f"\n🔗 Extracting player profile URLs...")
-    player_links = await page.locator(f'{valid_selector} a.rankings-page__name-link, {valid_selector} a.recruit').all()
+    # One round trip per query (not one get_attribute call per link); e.href is already absolute
+    player_urls = await page.eval_on_selector_all(
+        f'{valid_selector} a.rankings-page__name-link, {valid_selector} a.recruit', ALL_HREFS_JS
+    )
     
-    if not player_links:
-         player_links = await page.locator(f'{valid_selector} a[href*="/player/"]').all()
+    if not player_urls:
+         player_urls = await page.eval_on_selector_all(f'{valid_selector} a[href*="/player/"]', ALL_HREFS_JS)
 
-    player_urls = []
-    for link in player_links:
-        href = await link.get_attribute('href')
-        if href and '/player/' in href:
-            if href.startswith('/'): href = f"https://247sports.com{href}"
-            player_urls.append(href)
+    player_urls = [href for href in player_urls if '/player/' in href]
+    player_urls.extend(absolute_url(href) for href in more_hrefs or [])
     
-    player_urls = list(dict.fromkeys(player_urls))
+    # Normalize (no query/fragment, one trailing slash) before de-duplicating so
+    # headshot and name links to the same profile collapse; keeps rank order
+    player_urls = list(dict.fromkeys(normalize_player_url(u) for u in player_urls))
+    player_urls = [u for u in player_urls if extract_player_id(u) != "NA"]
     print(f"  ✓ Found {len(player_urls)} player profiles")
     
+    # The listing loaded, so this session is trusted - keep it for the next run
+    if player_urls:
+        await context.storage_state(path=str(STORAGE_STATE_PATH))
+    
     if TEST_MODE and len(player_urls) > 300:
         player_urls = player_urls[:300]
         print(f"  ℹ️  TEST MODE: Limited to 300 players")
     
-    await context.close()
+    await page.close()
     return player_urls
 
 # =============================================================================
@@ -203,314 +550,447 @@ async def click_load_more_until_complete(browser, year: int) -> list:
 # =============================================================================
 
 async def navigate_to_recruiting_profile(page) -> bool:
+    """Go straight to the recruiting profile's URL (no click, no post-click settle sleep)"""
     try:
         recruiting_link = page.locator('a:has-text("View recruiting profile"), a:has-text("Recruiting Profile")')
         if await recruiting_link.count() > 0:
-            await recruiting_link.first.click()
-            await page.wait_for_load_state('domcontentloaded', timeout=30000)
-            await page.wait_for_timeout(1000)
-            return True
+            href = await recruiting_link.first.get_attribute('href')
+            if href:
+                await page.goto(urljoin(page.url, href), wait_until='domcontentloaded', timeout=30000)
+                return True
         return False
     except:
         return False
 
-async def parse_timeline(page, data, year, do_deep_dive: bool):
+async def fetch_profile_html_http(client, url: str):
     """
-    Parses timeline for Commitment and Draft info.
+    Fetch recruiting-profile HTML over plain HTTP.
     
-    Args:
-        do_deep_dive: If True, clicks "See All Entries" and paginates for commitment.
-                      If False, only parses abbreviated timeline.
+    Returns (html, final_url) - final_url is where the HTML came from, for resolving
+    its relative links - or (None, None) if refused or not a real profile.
     """
     try:
-        # ALWAYS parse abbreviated timeline (for Draft info)
-        html = await page.content()
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        response = await client.get(url)
+        if response.status_code != 200:
+            return None, None
+        html = response.text
         
-        items = soup.select('.timeline-item, .timeline li, ul.timeline > li, .vertical-timeline-element-content')
+        # Same hop navigate_to_recruiting_profile makes - only if the rankings aren't already here
+        link_match = None if RE_RANKING_SECTION.search(html) else RE_RECRUITING_PROFILE_LINK.search(html)
+        if link_match:
+            response = await client.get(urljoin(str(response.url), unescape(link_match.group(1))))
+            if response.status_code != 200:
+                return None, None
+            html = response.text
         
-        for item in items:
-            item_text = clean_text(item.get_text())
+        # A bot-check, JS shell or hop-less landing page comes back 200 too - let the browser handle it
+        if not RE_RANKING_SECTION.search(html) or RE_BLOCK_PAGE.search(html):
+            return None, None
+        return html, str(response.url)
+    except httpx.HTTPError:
+        return None, None
+
+async def fetch_profile_html_browser(page, url: str) -> str:
+    """Fetch recruiting-profile fragments by driving the browser (fallback path)"""
+    await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    # Proceed as soon as profile content renders instead of a fixed settle sleep
+    try:
+        await page.wait_for_selector(PROFILE_READY_SELECTOR, timeout=10000)
+    except PlaywrightTimeoutError:
+        pass
+    
+    # The rankings are sometimes on the first page already - skip the extra page load then
+    if await page.locator(RANKING_SECTIONS_CSS).count() == 0:
+        await navigate_to_recruiting_profile(page)
+    
+    return await page.evaluate(PROFILE_FRAGMENT_JS)
+
+COMMITMENT_PRIORITY = {
+    'commitment': 100, 'committed': 100, 'commits to': 100,
+    'signed': 1, 'signing': 1,
+}
+
+def apply_commitment_item(item_text: str, data: dict, year: int, lowered: str = None, date_match=None) -> bool:
+    """
+    Applies a commitment/signing timeline entry to data if it outranks the current one.
+    
+    Callers that already lowercased the text or ran RE_DATE on it can pass
+    those in. Returns True when a commitment (priority 100) was recorded.
+    """
+    if lowered is None:
+        lowered = item_text.lower()
+    
+    # One scan for every keyword; a commitment outranks a signing mentioned alongside it
+    item_priority = max((COMMITMENT_PRIORITY[k] for k in RE_COMMITMENT_KEYWORD.findall(lowered)), default=0)
+    
+    if item_priority > 0:
+        if date_match is None:
+            date_match = RE_DATE.search(item_text)
+        found_date = normalize_date(date_match.group(1)) if date_match else "NA"
+        
+        if found_date != "NA" and is_date_valid_for_class(found_date, year):
+            current_priority = data.get('_date_priority', -1)
             
-            # --- DRAFT LOGIC (always needed) ---
-            if 'draft' in item_text.lower():
-                date_match = re.search(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})', item_text)
-                if date_match and data['Draft Date'] == "NA":
-                     data['Draft Date'] = normalize_date(date_match.group(1))
+            if item_priority > current_priority:
+                data['Signed Date'] = found_date
+                data['_date_priority'] = item_priority
                 
-                # Extract team name, excluding the word "Draft" itself
-                team_match = re.search(r'(?:Draft[:\s]+)?([A-Z][A-Za-z0-9\s\.]+?)\s+(?:select|pick)', item_text, re.IGNORECASE)
-                if team_match and data['Draft Team'] == "NA":
-                    team_name = clean_text(team_match.group(1))
-                    # Strip 'Draft' prefix if it got captured
-                    team_name = re.sub(r'^Draft\s*', '', team_name, flags=re.IGNORECASE).strip()
-                    if team_name and team_name.lower() not in ['draft']:
-                        data['Draft Team'] = team_name
-            
-            # --- COMMITMENT from abbreviated timeline ---
-            item_priority = 0
-            if 'commitment' in item_text.lower() or 'committed' in item_text.lower() or 'commits to' in item_text.lower():
-                 item_priority = 100
-            elif 'signed' in item_text.lower() or 'signing' in item_text.lower():
-                 item_priority = 1
-            
-            if item_priority > 0:
-                date_match = re.search(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})', item_text)
-                found_date = normalize_date(date_match.group(1)) if date_match else "NA"
+                team_match = RE_TEAM.search(item_text)
+                if team_match:
+                    data['Signed Team'] = clean_text(team_match.group(1))
                 
-                if found_date != "NA" and is_date_valid_for_class(found_date, year):
-                    current_priority = data.get('_date_priority', -1)
-                    
-                    if item_priority > current_priority:
-                        data['Signed Date'] = found_date
-                        data['_date_priority'] = item_priority
-                        
-                        team_match = re.search(r'(?:to|with|at|commits to)\s+([A-Z][^,.]+)', item_text)
-                        if team_match:
-                            data['Signed Team'] = clean_text(team_match.group(1))
+                return item_priority == 100
+    return False
+
+def parse_abbreviated_timeline(soup, data, year):
+    """Parses the profile's abbreviated timeline for Draft and Commitment info"""
+    items = SEL_TIMELINE_ITEMS.select(soup)
+    
+    for item in items:
+        item_text = clean_text(item.get_text())
+        lowered = item_text.lower()
+        date_match = None
         
-        # --- DEEP DIVE (only for top players) ---
-        if do_deep_dive:
-            # Scroll to find timeline section
-            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            await page.wait_for_timeout(1500)
+        # --- DRAFT LOGIC (always needed) ---
+        if 'draft' in lowered:
+            date_match = RE_DATE.search(item_text)
+            if date_match and data['Draft Date'] == "NA":
+                 data['Draft Date'] = normalize_date(date_match.group(1))
             
-            see_all_link = page.locator('a[href*="TimelineEvents"]')
-            if await see_all_link.count() > 0:
-                href = await see_all_link.first.get_attribute('href')
-                if href:
-                    full_timeline_url = f"https://247sports.com{href}" if href.startswith('/') else href
-                    try:
-                        await page.goto(full_timeline_url, wait_until='domcontentloaded', timeout=15000)
+            # Extract team name, excluding the word "Draft" itself
+            team_match = RE_DRAFT_TEAM.search(item_text)
+            if team_match and data['Draft Team'] == "NA":
+                team_name = clean_text(team_match.group(1))
+                # Strip 'Draft' prefix if it got captured
+                team_name = RE_DRAFT_PREFIX.sub('', team_name).strip()
+                if team_name and team_name.lower() not in ['draft']:
+                    data['Draft Team'] = team_name
+        
+        # --- COMMITMENT from abbreviated timeline ---
+        apply_commitment_item(item_text, data, year, lowered, date_match)
+
+def parse_full_timeline_items(item_texts, data, year, consumed: list) -> bool:
+    """
+    Parses one page of full-timeline item texts for Commitment info.
+    
+    Appends each item's text to consumed (for the cache) and returns True
+    as soon as a commitment is found, so pagination can stop early.
+    """
+    for item_text in item_texts:
+        consumed.append(item_text)
+        if apply_commitment_item(clean_text(item_text), data, year):
+            return True
+    return False
+
+def timeline_item_texts(doc):
+    """Lazily yields the text of each full-timeline item in an lxml document"""
+    return (item.text_content() for item in XP_FULL_TIMELINE_ITEMS(doc))
+
+def save_timeline_cache(player_id: str, timeline_items: list):
+    items_html = "".join(f"<li>{escape(item_text)}</li>" for item_text in timeline_items)
+    save_cached(f"{player_id}.timeline", f'<ul class="timeline-event-index_lst">{items_html}</ul>')
+
+async def deep_dive_timeline(page, data, year):
+    """Clicks through to "See All Entries" and paginates the full timeline for commitment"""
+    try:
+        # Scroll to find timeline section. The link is in the HTML at domcontentloaded when the
+        # profile has one, so only wait (briefly) for it while the page is still loading
+        await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+        see_all_link = page.locator('a[href*="TimelineEvents"]')
+        if await see_all_link.count() == 0 and await page.evaluate('document.readyState') != 'complete':
+            try:
+                await page.wait_for_selector('a[href*="TimelineEvents"]', state='attached', timeout=1500)
+            except PlaywrightTimeoutError:
+                pass
+        
+        timeline_items = []
+        complete = True  # Only a timeline read without errors is cached
+        if await see_all_link.count() > 0:
+            href = await see_all_link.first.get_attribute('href')
+            if href:
+                try:
+                    await page.goto(urljoin(page.url, href), wait_until='domcontentloaded', timeout=15000)
+                    
+                    # Parse full timeline with pagination and EARLY EXIT
+                    page_count = 0
+                    
+                    while page_count < TIMELINE_MAX_PAGES:
+                        # Item texts straight from the live DOM - no re-parse of the page HTML
+                        item_texts = await page.locator('ul.timeline-event-index_lst li').all_inner_texts()
                         
-                        # Parse full timeline with pagination and EARLY EXIT
-                        page_count = 0
-                        max_pages = 10
+                        # EARLY EXIT - Found commitment (priority 100)!
+                        if parse_full_timeline_items(item_texts, data, year, timeline_items):
+                            break  # Stop pagination immediately
                         
-                        while page_count < max_pages:
-                            html = await page.content()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            
-                            full_items = soup.select('ul.timeline-event-index_lst li')
-                            
-                            for item in full_items:
-                                item_text = clean_text(item.get_text())
-                                
-                                item_priority = 0
-                                if 'commitment' in item_text.lower() or 'committed' in item_text.lower() or 'commits to' in item_text.lower():
-                                     item_priority = 100
-                                elif 'signed' in item_text.lower() or 'signing' in item_text.lower():
-                                     item_priority = 1
-                                
-                                if item_priority > 0:
-                                    date_match = re.search(r'([A-Z][a-z]+\s+\d{1,2},\s+\d{4}|\d{1,2}/\d{1,2}/\d{4})', item_text)
-                                    found_date = normalize_date(date_match.group(1)) if date_match else "NA"
-                                    
-                                    if found_date != "NA" and is_date_valid_for_class(found_date, year):
-                                        current_priority = data.get('_date_priority', -1)
-                                        
-                                        if item_priority > current_priority:
-                                            data['Signed Date'] = found_date
-                                            data['_date_priority'] = item_priority
-                                            
-                                            team_match = re.search(r'(?:to|with|at|commits to)\s+([A-Z][^,.]+)', item_text)
-                                            if team_match:
-                                                data['Signed Team'] = clean_text(team_match.group(1))
-                                            
-                                            # EARLY EXIT - Found commitment (priority 100)!
-                                            if item_priority == 100:
-                                                return  # Stop pagination immediately
-                            
-                            # Pagination
-                            next_button = page.locator('li.next_itm a')
-                            if await next_button.count() > 0 and await next_button.is_visible():
+                        # Pagination
+                        next_button = page.locator('li.next_itm a')
+                        if await next_button.count() > 0 and await next_button.is_visible():
+                            async with page.expect_navigation(wait_until='domcontentloaded', timeout=15000):
                                 await next_button.click()
-                                await page.wait_for_timeout(1000)
-                                page_count += 1
-                            else:
-                                break
-                                
-                    except Exception:
-                        pass  # Silent fail on timeline deep dive
+                            page_count += 1
+                        else:
+                            break
+                            
+                except Exception:
+                    complete = False  # Silent fail on timeline deep dive
+        
+        if USE_CACHE and complete:
+            save_timeline_cache(data['247 ID'], timeline_items)
 
     except Exception:
         pass
 
-async def parse_profile(page, url: str, year: int, player_num: int, total: int) -> dict:
-    data = {header: "NA" for header in CSV_HEADERS}
+async def deep_dive_timeline_http(client, profile_html: str, profile_url: str, data, year):
+    """Same as deep_dive_timeline, but follows the TimelineEvents/next-page links over HTTP"""
+    timeline_items = []
+    complete = True  # Only a timeline read without errors is cached
+    link_match = RE_TIMELINE_LINK.search(profile_html)
+    if link_match:
+        next_url = urljoin(profile_url, unescape(link_match.group(1)))
+        try:
+            for _ in range(TIMELINE_MAX_PAGES):
+                response = await client.get(next_url)
+                if response.status_code != 200 or not response.text.strip():
+                    complete = False
+                    break
+                doc = lxml_html.fromstring(response.content)  # Bytes: lxml rejects str with an encoding declaration
+                
+                # EARLY EXIT - Found commitment (priority 100)!
+                if parse_full_timeline_items(timeline_item_texts(doc), data, year, timeline_items):
+                    break
+                
+                next_hrefs = XP_TIMELINE_NEXT_HREF(doc)
+                if not next_hrefs:
+                    break
+                next_url = urljoin(str(response.url), next_hrefs[0])  # Next links may be relative (?Page=2)
+        except Exception:
+            complete = False  # Silent fail on timeline deep dive (the profile row is kept)
+    
+    if USE_CACHE and complete:
+        save_timeline_cache(data['247 ID'], timeline_items)
+
+def classify_rank_link(href: str):
+    """Classify a ranks-list link by its query string: 'position', 'state', 'national' or None"""
+    # Position Rank (has Position= in URL)
+    if 'Position=' in href:
+        return 'position'
+    # State Ranks have both InstitutionGroup AND State parameter
+    if 'State=' in href or 'state=' in href:
+        return 'state'
+    # National Rank (has InstitutionGroup=HighSchool but NO State parameter)
+    if 'InstitutionGroup=HighSchool' in href:
+        return 'national'
+    return None
+
+def set_position_rank(data, prefix, li, link_tag):
+    pos_node = li.find('b')
+    if pos_node:
+        data[f'{prefix} Position'] = clean_text(pos_node.get_text())
+    
+    rank_node = link_tag.find('strong')
+    if rank_node:
+        data[f'{prefix} Position Rank'] = parse_rank(rank_node.get_text())
+
+def set_national_rank(data, prefix, li, link_tag):
+    rank_node = link_tag.find('strong')
+    if rank_node:
+        data[f'{prefix} National Rank'] = parse_rank(rank_node.get_text())
+
+# State ranks are deliberately absent (skipped entirely)
+RANK_HANDLERS = {
+    'position': set_position_rank,
+    'national': set_national_rank,
+}
+
+def new_player_row(url: str, year: int) -> dict:
+    data = DEFAULT_ROW.copy()
+    data['247 ID'] = extract_player_id(url)
     data['Profile URL'] = url
     data['Recruiting Year'] = str(year)
     data['Scrape Date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     data['Data Source'] = '247Sports Composite'
     data['_date_priority'] = -1
+    return data
+
+# Header item label -> CSV column
+HEADER_FIELDS = {
+    'Pos': 'Position', 'Position': 'Position',
+    'Height': 'Height', 'Weight': 'Weight', 'High School': 'High School',
+    'Home Town': 'City, ST', 'Hometown': 'City, ST', 'City': 'City, ST',
+    'Class': 'Class',
+}
+
+def parse_profile_html(html: str, url: str, year: int) -> dict:
+    """Parse a recruiting profile (header, rankings, abbreviated timeline) from its HTML"""
+    data = new_player_row(url, year)
+    soup = BeautifulSoup(html, 'lxml', parse_only=PROFILE_STRAINER)
     
-    try:
-        await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-        await page.wait_for_timeout(1000)
+    # --- HEADER INFO ---
+    name_elem = soup.find(class_='name')
+    if name_elem: data['Player Name'] = clean_text(name_elem.get_text())
+    
+    all_header_items = SEL_METRICS_ITEMS.select(soup) + SEL_DETAILS_ITEMS.select(soup) + SEL_VITALS_ITEMS.select(soup)
+    for item in all_header_items:
+        # One scan finds the label and its value; the label picks the column
+        match = RE_HEADER_ITEM.search(item.get_text(strip=True))
+        if not match: continue
+        field = HEADER_FIELDS[match.group(1)]
+        value = match.group(2)
+        data[field] = normalize_height(value) if field == 'Height' else clean_text(value)
+    
+    data['Class'] = str(year)
+    
+    # --- RANKINGS ---
+    ranking_sections = SEL_RANKING_SECTIONS.select(soup)
+    
+    done_prefixes = set()
+    for section in ranking_sections:
+        header = section.find('h3')  # Any h3 (covers .rankings-header h3 / h3.title)
+        if not header: continue
         
-        await navigate_to_recruiting_profile(page)
+        header_text = clean_text(header.get_text()).upper()
+        prefix = None
+        if "COMPOSITE" in header_text:
+            prefix = "Composite"
+        elif "247SPORTS" in header_text:
+            prefix = "247"
+        if not prefix or prefix in done_prefixes: continue
         
-        html = await page.content()
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        stars = SEL_STARS.select(section)
+        if stars: data[f'{prefix} Stars'] = str(min(len(stars), 5))
         
-        data['247 ID'] = extract_player_id(url)
+        rating_elem = section.find(class_=['rank-block', 'score', 'rating'])
+        if rating_elem:
+            rating_text = clean_text(rating_elem.get_text())
+            rating_match = RE_NUMBER.search(rating_text)
+            if rating_match: data[f'{prefix} Rating'] = rating_match.group(1)
+
+        ranks_list = section.find('ul', class_='ranks-list')
+        if ranks_list:
+            rank_fields = [f'{prefix} National Rank', f'{prefix} Position', f'{prefix} Position Rank']
+            for li in ranks_list.find_all('li', recursive=False):
+                link_tag = li.find('a')
+                if not link_tag: continue
+                
+                handler = RANK_HANDLERS.get(classify_rank_link(link_tag.get('href', '')))
+                if handler:
+                    handler(data, prefix, li, link_tag)
+                    if all(data[field] != "NA" for field in rank_fields):
+                        break  # Every rank for this prefix is filled
         
-        # --- HEADER INFO ---
-        name_elem = soup.select_one('.name') or soup.select_one('h1.name')
-        if name_elem: data['Player Name'] = clean_text(name_elem.get_text())
+        done_prefixes.add(prefix)
+        if len(done_prefixes) == 2:
+            break  # Composite and 247 both read - skip any remaining sections
+
+    # --- TIMELINE (abbreviated; deep dive happens after fetch) ---
+    parse_abbreviated_timeline(soup, data, year)
+
+    # Fallback for Signed Team (timeline entries found later still take precedence)
+    if data['Signed Team'] == "NA":
+        commit_banner = soup.find(class_=['commit-banner', 'commitment'])
+        if commit_banner:
+            team_elem = commit_banner.find(['span', 'a'])
+            if team_elem:
+                team_text = clean_text(team_elem.get_text())
+                if team_text.lower() not in ['committed', 'commitment', 'signed']:
+                    data['Signed Team'] = team_text
+    
+    return data
+
+async def parse_profile(page, url: str, year: int, player_num: int = 1, total: int = 1, client=None, page_pool=None, parse_pool=None) -> dict:
+    """
+    Fetch and parse one profile: cache first, then HTTP (client), then the browser page.
+    
+    With page=None a page is borrowed from page_pool only if the browser is needed.
+    HTML is parsed in parse_pool (a process pool) when given, else in a thread.
+    Players within DEEP_TIMELINE_LIMIT also get the full-timeline deep dive
+    over whichever transport fetched the profile.
+    """
+    player_id = extract_player_id(url)
+    do_deep_dive = player_num <= DEEP_TIMELINE_LIMIT
+    
+    try:
+        html = load_cached(player_id)
+        source = 'cache' if html is not None else None
         
-        all_header_items = soup.select('.metrics-list li') + soup.select('.details li') + soup.select('ul.vitals li')
-        for item in all_header_items:
-            text = item.get_text(strip=True)
-            if 'Pos' in text or 'Position' in text:
-                match = re.search(r'(?:Pos|Position)[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Position'] = clean_text(match.group(1))
-            elif 'Height' in text:
-                match = re.search(r'Height[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Height'] = normalize_height(match.group(1))
-            elif 'Weight' in text:
-                match = re.search(r'Weight[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Weight'] = clean_text(match.group(1))
-            elif 'High School' in text:
-                match = re.search(r'High School[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['High School'] = clean_text(match.group(1))
-            elif 'Home Town' in text or 'Hometown' in text or 'City' in text:
-                match = re.search(r'(?:Home Town|Hometown|City)[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['City, ST'] = clean_text(match.group(1))
-            elif 'Class' in text:
-                match = re.search(r'Class[:\s]*(.*)', text, re.IGNORECASE)
-                if match: data['Class'] = clean_text(match.group(1))
+        if html is None and client is not None:
+            html, html_url = await fetch_profile_html_http(client, url)
+            source = 'http'
+        if html is None and page is None:
+            # HTTP was refused - hold a browser page for the rest of this profile only
+            async with pooled_page(page_pool) as page:
+                return await parse_profile(page, url, year, player_num, total, parse_pool=parse_pool)
+        if html is None:
+            html = await fetch_profile_html_browser(page, url)
+            source = 'browser'
         
-        data['Class'] = str(year)
+        # Never cache a challenge/empty page - it would replay as an all-NA row on every later run
+        if USE_CACHE and source != 'cache' and RE_PROFILE_CONTENT.search(html):
+            save_cached(player_id, html)
         
-        # --- RANKINGS ---
-        ranking_sections = soup.select('section.rankings, section.rankings-section, div.ranking-section')
+        # Parse off the event loop so other profiles' network I/O isn't stalled behind it
+        if parse_pool is not None:
+            data = await asyncio.get_running_loop().run_in_executor(parse_pool, parse_profile_html, html, url, year)
+        else:
+            data = await asyncio.to_thread(parse_profile_html, html, url, year)
         
-        for section in ranking_sections:
-            header = section.select_one('.rankings-header h3, h3.title, h3')
-            if not header: continue
-            
-            header_text = clean_text(header.get_text()).upper()
-            prefix = None
-            if "COMPOSITE" in header_text:
-                prefix = "Composite"
-            elif "247SPORTS" in header_text and "COMPOSITE" not in header_text:
-                prefix = "247"
-            if not prefix: continue
-            
-            stars = section.select('span.icon-starsolid.yellow, i.icon-starsolid.yellow')
-            if stars: data[f'{prefix} Stars'] = str(min(len(stars), 5))
-            
-            rating_elem = section.select_one('.rank-block, .score, .rating')
-            if rating_elem:
-                rating_text = clean_text(rating_elem.get_text())
-                rating_match = re.search(r'(\d+(?:\.\d+)?)', rating_text)
-                if rating_match: data[f'{prefix} Rating'] = rating_match.group(1)
-
-            ranks_list = section.select_one('ul.ranks-list')
-            if ranks_list:
-                for li in ranks_list.select('li'):
-                    pos_node = li.select_one('b')
-                    link_tag = li.select_one('a')
-                    
-                    if link_tag:
-                        href = link_tag.get('href', '')
-                        li_text = clean_text(li.get_text())
-                        
-                        # Position Rank (has Position= in URL)
-                        if 'Position=' in href:
-                            if pos_node: 
-                                data[f'{prefix} Position'] = clean_text(pos_node.get_text())
-                            
-                            rank_node = link_tag.select_one('strong')
-                            if rank_node: 
-                                data[f'{prefix} Position Rank'] = parse_rank(rank_node.get_text())
-                        
-                        # Skip State Ranks explicitly (has both InstitutionGroup AND State parameter)
-                        elif 'State=' in href or 'state=' in href:
-                            continue  # Skip state ranks entirely
-                        
-                        # National Rank (has InstitutionGroup=HighSchool but NO State parameter)
-                        elif 'InstitutionGroup=HighSchool' in href:
-                             rank_node = link_tag.select_one('strong')
-                             if rank_node: 
-                                 data[f'{prefix} National Rank'] = parse_rank(rank_node.get_text())
-
-        # --- TIMELINE (with conditional deep dive) ---
-        do_deep_dive = player_num <= DEEP_TIMELINE_LIMIT
-        await parse_timeline(page, data, year, do_deep_dive)
-
-        # Fallback for Signed Team
-        if data['Signed Team'] == "NA":
-            commit_banner = soup.select_one('.commit-banner, .commitment')
-            if commit_banner:
-                team_elem = commit_banner.select_one('span, a')
-                if team_elem:
-                    team_text = clean_text(team_elem.get_text())
-                    if team_text.lower() not in ['committed', 'commitment', 'signed']:
-                        data['Signed Team'] = team_text
+        # --- TIMELINE DEEP DIVE (top players only) ---
+        if do_deep_dive:
+            if source == 'cache':
+                timeline_html = load_cached(f"{player_id}.timeline")
+                if timeline_html:
+                    parse_full_timeline_items(timeline_item_texts(lxml_html.fromstring(timeline_html)), data, year, [])
+            elif source == 'http':
+                await deep_dive_timeline_http(client, html, html_url, data, year)
+            else:
+                await deep_dive_timeline(page, data, year)
         
         return data
         
     except Exception as e:
-        print(f"    ❌ Error parsing {data.get('Player Name', 'Unknown')}: {e}")
-        return data
+        print(f"    ❌ Error parsing {url}: {e}")
+        return new_player_row(url, year)
 
 # =============================================================================
 # CONCURRENT SCRAPING
 # =============================================================================
 
-async def scrape_player_batch(browser, urls: list, year: int, batch_num: int, total_players: int) -> list:
-    tasks = []
-    context = await browser.new_context(user_agent=USER_AGENT)
-    
-    for i, url in enumerate(urls):
-        page = await context.new_page()
-        player_num = batch_num * MAX_CONCURRENT + i + 1
-        tasks.append(scrape_player(page, url, year, player_num, total_players))
-    
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    await context.close()
-    
-    valid_results = []
-    for result in results:
-        if isinstance(result, dict):
-            if '_date_priority' in result: del result['_date_priority']
-            valid_results.append(result)
-    return valid_results
-
-async def scrape_player(page, url: str, year: int, player_num: int, total: int) -> dict:
+async def scrape_player(profile_slots: asyncio.Semaphore, page_pool: PagePool, parse_pool, client, url: str, year: int, player_num: int, total: int) -> tuple:
+    """Scrape one profile; returns (player_num, row) and never raises (errors become a blank row)"""
     try:
-        print(f"  [{player_num}/{total}] {url.split('/')[-2]}")
-        data = await parse_profile(page, url, year, player_num, total)
+        async with profile_slots:
+            print(f"  [{player_num}/{total}] {url.split('/')[-2]}")
+            data = await parse_profile(None, url, year, player_num, total, client=client, page_pool=page_pool, parse_pool=parse_pool)
+        data.pop('_date_priority', None)
         
         if data['Player Name'] != "NA":
             deep_marker = "🔍" if player_num <= DEEP_TIMELINE_LIMIT else "⚡"
             print(f"    ✓ {deep_marker} {data['Player Name']} - {data['Position']} - {data['Composite Stars']}⭐")
         
-        return data
+        return player_num, data
     except Exception as e:
         print(f"    ❌ Error: {e}")
-        return {header: "NA" for header in CSV_HEADERS}
-    finally:
-        await page.close()
+        return player_num, DEFAULT_ROW.copy()
 
 # =============================================================================
 # MAIN SCRAPER
 # =============================================================================
 
-async def scrape_year(browser, year: int) -> list:
+async def scrape_year(browser, parse_pool, year: int, csv_file, writer, completeness: dict) -> int:
     print(f"\n{'='*80}")
     print(f"🎓 SCRAPING {year} RECRUITING CLASS")
     print(f"{'='*80}")
     
-    player_urls = await click_load_more_until_complete(browser, year)
+    # One context per year: the listing page, the profile page pool and the
+    # HTTP client's cookies all come from it
+    context = await new_scraping_context(browser)
+    
+    player_urls = await click_load_more_until_complete(context, year)
     
     if not player_urls:
         print(f"  ❌ No players found for {year}")
-        return []
+        await context.close()
+        return 0
     
     # Resume capability
     if START_FROM_PLAYER > 0:
@@ -521,39 +1001,49 @@ async def scrape_year(browser, year: int) -> list:
     print(f"   🔍 Deep timeline for first {DEEP_TIMELINE_LIMIT} (commitment dates)")
     print(f"   ⚡ Fast scrape for remaining players (draft only)")
     
-    # Setup incremental CSV
-    year_range = f"{min(YEARS)}-{max(YEARS)}" if len(YEARS) > 1 else str(YEARS[0])
-    timestamp = datetime.now().strftime('%Y%m%d')
-    filename = OUTPUT_DIR / f"recruiting_class_{year_range}_{timestamp}.csv"
+    # Profiles are static HTML: fetch them over HTTP, reusing the cookies the
+    # real browser earned on the listing page to get past bot checks
+    cookies = {c['name']: c['value'] for c in await context.cookies()}
     
-    all_data = []
-    batch_buffer = []  # Buffer for incremental saves every 100 players
+    scraped = 0
+    profile_slots = asyncio.Semaphore(PROFILE_CONCURRENT)
     
-    for i in range(0, len(player_urls), MAX_CONCURRENT):
-        batch = player_urls[i:i + MAX_CONCURRENT]
-        batch_num = i // MAX_CONCURRENT
-        
-        print(f"\n  📦 Batch {batch_num + 1}/{(len(player_urls) + MAX_CONCURRENT - 1) // MAX_CONCURRENT}")
-        batch_data = await scrape_player_batch(browser, batch, year, batch_num, len(player_urls))
-        
-        all_data.extend(batch_data)
-        batch_buffer.extend(batch_data)
-        
-        # INCREMENTAL SAVE - Every 100 players
-        if len(batch_buffer) >= 100:
-            append_to_csv(filename, batch_buffer)
-            print(f"    💾 Saved {len(batch_buffer)} players to CSV")
-            batch_buffer = []  # Clear buffer
+    # Reusable pages for the browser fallback; the pool recycles the context itself
+    page_pool = PagePool(browser, context)
+    
+    async with new_http_client(cookies) as client:
+        # profile_slots bounds concurrency: a new profile starts as soon as any slot frees up;
+        # only the ones HTTP can't serve wait on page_pool
+        tasks = [scrape_player(profile_slots, page_pool, parse_pool, client, url, year, i, len(player_urls)) for i, url in enumerate(player_urls, 1)]
         
-        print(f"    → Progress: {len(all_data)}/{len(player_urls)} players")
+        # Results arrive in completion order but are written in rank order: a finished
+        # row waits in pending until every earlier player is written, so a cut-off run
+        # always leaves a prefix of player_urls (START_FROM resumes from the row count)
+        pending = {}
+        next_num = 1
+        for next_done in asyncio.as_completed(tasks):
+            player_num, data = await next_done
+            pending[player_num] = data
+            
+            while next_num in pending:
+                # STREAMING SAVE - every row hits disk as soon as its turn comes
+                row = ROW_VALUES(pending.pop(next_num))
+                writer.writerow(row)
+                csv_file.flush()
+                scraped += 1
+                next_num += 1
+                
+                # Completeness tallied while the row is in hand (no second pass over the data)
+                for value in row:
+                    completeness['total'] += 1
+                    completeness['filled'] += value != "NA"
+                
+                print(f"    → Progress: {scraped}/{len(player_urls)} players")
     
-    # Save any remaining players in buffer
-    if batch_buffer:
-        append_to_csv(filename, batch_buffer)
-        print(f"    💾 Saved final {len(batch_buffer)} players to CSV")
+    await page_pool.close()  # Closes the current context and its pooled pages
     
-    print(f"\n✅ Completed {year}: {len(all_data)} players scraped")
-    return all_data
+    print(f"\n✅ Completed {year}: {scraped} players scraped")
+    return scraped
 
 async def main():
     print("\n" + "="*80)
@@ -561,7 +1051,7 @@ async def main():
     print("="*80)
     print(f"📅 Years: {YEARS}")
     print(f"🧪 Test Mode: {TEST_MODE}")
-    print(f"⚡ Concurrency: {MAX_CONCURRENT}")
+    print(f"⚡ Concurrency: {PROFILE_CONCURRENT} profiles ({MAX_CONCURRENT} browser pages) x {MAX_CONCURRENT_YEARS} years")
     print(f"🔍 Deep Timeline Limit: Top {DEEP_TIMELINE_LIMIT} players")
     if START_FROM_PLAYER > 0:
         print(f"⏩ Resume Mode: Starting from player #{START_FROM_PLAYER}")
@@ -569,25 +1059,43 @@ async def main():
     
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        all_players = []
-        
-        for year in YEARS:
-            year_data = await scrape_year(browser, year)
-            all_players.extend(year_data)
-        
-        await browser.close()
+    year_range = f"{min(YEARS)}-{max(YEARS)}" if len(YEARS) > 1 else str(YEARS[0])
+    timestamp = datetime.now().strftime('%Y%m%d')
+    filename = OUTPUT_DIR / f"recruiting_class_{year_range}_{timestamp}.csv"
+    
+    csv_file, writer = open_csv_writer(filename)
+    total_players = 0
+    completeness = {'filled': 0, 'total': 0}
+    # Spawned (not forked) workers: forking after Playwright starts would copy its driver threads/pipes
+    parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            
+            year_slots = asyncio.Semaphore(MAX_CONCURRENT_YEARS)
+            
+            async def scrape_year_bounded(year: int) -> int:
+                async with year_slots:
+                    return await scrape_year(browser, parse_pool, year, csv_file, writer, completeness)
+            
+            year_counts = await asyncio.gather(*(scrape_year_bounded(year) for year in YEARS))
+            total_players = sum(year_counts)
+            
+            await browser.close()
+    finally:
+        parse_pool.shutdown()
+        csv_file.close()
     
-    if not all_players:
+    if not total_players:
         print("\n❌ CRITICAL: No data scraped.")
         sys.exit(1)
 
     print(f"\n{'='*80}")
     print(f"✅ SCRAPING COMPLETE!")
     print(f"{'='*80}")
-    print(f"📊 Total Players: {len(all_players)}")
-    print(f"💾 Data saved incrementally throughout run")
+    print(f"📊 Total Players: {total_players}")
+    print(f"📈 Data Completeness: {completeness['filled'] / completeness['total'] * 100:.1f}%")
+    print(f"💾 Data streamed to {filename}")
     print(f"{'='*80}\n")
 
 if __name__ == "__main__":